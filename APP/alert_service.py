@@ -1,32 +1,53 @@
-import uuid
+import bisect
 import datetime
+import itertools
 import threading
 import time
-from typing import Dict, List, Optional
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
 from interfaces import IAlertService
 from models import Anomaly, User, Alert
 
+# Alert ids are process-local keys; seeded with the start time to stay unique across runs
+_alert_ids = itertools.count(int(time.time() * 1e6))
+
 class GuiAlertService(IAlertService):
     def __init__(self, app, auto_confirm_timeout: Optional[int] = 120):
         self.alerts: Dict[str, Alert] = {}
         self.app = app
         self.auto_confirm_timeout = auto_confirm_timeout
-        self.confirmed_times: Dict[str, datetime.datetime] = {}
+        # time.monotonic_ns() of each confirmation; plain ints compare cheaply in split_confirmed_alerts
+        self.confirmed_times: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        # Bumped on every alert change so views can skip refreshes when nothing changed
+        self.version = 0
+        self._by_anomaly_id: Dict[str, Alert] = {}
+        # Confirmed alerts keyed by anomaly_id, in confirmation order
+        self._confirmed: Dict[str, Alert] = {}
+        # The same confirmed alerts bucketed by data type, so a role reads only its own
+        self._confirmed_by_type: Dict[str, Dict[str, Alert]] = defaultdict(dict)
+        self._refresh_cb = self._safe_refresh_alerts_view
+        self._app_after = getattr(app, 'after', None)
 
-    def send_alert(self, anomaly: Anomaly, user: User):
-        alert_id = str(uuid.uuid4())
-        message = f"Alert for user {user.username}: Anomaly {anomaly.description} Score: {anomaly.score}"
-        alert = Alert(alert_id, anomaly.anomaly_id, datetime.datetime.now(), message, "open")
-        self.alerts[alert_id] = alert
+    def send_alert(self, anomaly: Anomaly, user: User) -> Alert:
+        alert_id = f"al{next(_alert_ids)}"
+        alert = Alert(alert_id, anomaly.anomaly_id, datetime.datetime.now(), user.username, "open",
+                      anomaly.data_type)
+        with self._lock:
+            self.alerts[alert_id] = alert
+            self._by_anomaly_id[anomaly.anomaly_id] = alert
+            self.version += 1
 
-        if self.auto_confirm_timeout and self.auto_confirm_timeout > 0:
-            threading.Thread(target=self.auto_confirm, args=(alert_id,), daemon=True).start()
+        # send_alert runs on the Tk thread, so the timeout is a plain Tk timer
+        if self._app_after is not None and self.auto_confirm_timeout and self.auto_confirm_timeout > 0:
+            self._app_after(self.auto_confirm_timeout * 1000, self.auto_confirm, alert_id)
 
-        try:
-            if getattr(self.app, 'current_view', None) == 'Alerts':
-                self.app.after(0, lambda: self._safe_refresh_alerts_view())
-        except Exception:
-            pass
+        self._schedule_refresh()
+        return alert
+
+    def _schedule_refresh(self):
+        if self._app_after is not None and getattr(self.app, 'current_view', None) == 'Alerts':
+            self._app_after(0, self._refresh_cb)
 
     def _safe_refresh_alerts_view(self):
         try:
@@ -43,37 +64,51 @@ class GuiAlertService(IAlertService):
             pass
 
     def auto_confirm(self, alert_id: str):
-        try:
-            time.sleep(self.auto_confirm_timeout)
-            if alert_id in self.alerts and self.alerts[alert_id].status == 'open':
-                def do_confirm():
-                    self.update_alert_status(alert_id, 'confirmed')
-                try:
-                    self.app.after(0, do_confirm)
-                except Exception:
-                    try:
-                        do_confirm()
-                    except Exception:
-                        pass
-        except Exception:
-            pass
+        with self._lock:
+            alert = self.alerts.get(alert_id)
+            is_open = alert is not None and alert.status == 'open'
+        if is_open:
+            self.update_alert_status(alert_id, 'confirmed')
 
     def update_alert_status(self, alert_id: str, new_status: str):
-        if alert_id in self.alerts:
-            self.alerts[alert_id].status = new_status
+        with self._lock:
+            alert = self.alerts.get(alert_id)
+            if alert is None:
+                return
+            alert.status = new_status
+            self.version += 1
             if new_status == 'confirmed':
-                self.confirmed_times[alert_id] = datetime.datetime.now()
-            elif alert_id in self.confirmed_times:
-                del self.confirmed_times[alert_id]
+                self.confirmed_times[alert_id] = time.monotonic_ns()
+                # Re-inserting keeps _confirmed ordered by confirmation time
+                self._confirmed.pop(alert.anomaly_id, None)
+                self._confirmed[alert.anomaly_id] = alert
+                bucket = self._confirmed_by_type[alert.data_type]
+                bucket.pop(alert.anomaly_id, None)
+                bucket[alert.anomaly_id] = alert
+            else:
+                self.confirmed_times.pop(alert_id, None)
+                self._confirmed.pop(alert.anomaly_id, None)
+                self._confirmed_by_type[alert.data_type].pop(alert.anomaly_id, None)
 
-            try:
-                if getattr(self.app, 'current_view', None) == 'Alerts':
-                    try:
-                        self.app.after(0, lambda: self._safe_refresh_alerts_view())
-                    except Exception:
-                        pass
-            except Exception:
-                pass
+        self._schedule_refresh()
 
     def get_alerts(self) -> List[Alert]:
-        return list(self.alerts.values())
\ No newline at end of file
+        with self._lock:
+            return list(self.alerts.values())
+
+    def get_alert_by_anomaly(self, anomaly_id: str) -> Optional[Alert]:
+        return self._by_anomaly_id.get(anomaly_id)
+
+    def get_confirmed_anomaly_ids(self, data_type: Optional[str] = None) -> Set[str]:
+        with self._lock:
+            if data_type is None:
+                return set(self._confirmed)
+            return set(self._confirmed_by_type.get(data_type, ()))
+
+    def split_confirmed_alerts(self, data_type: str, since: int) -> Tuple[List[Alert], List[Alert]]:
+        """Confirmed alerts of a type as (confirmed after `since`, confirmed earlier); `since` is monotonic ns"""
+        with self._lock:
+            alerts = list(self._confirmed_by_type.get(data_type, {}).values())
+            times = [self.confirmed_times[al.alert_id] for al in alerts]
+        index = bisect.bisect_right(times, since)
+        return alerts[index:], alerts[:index]
\ No newline at end of file
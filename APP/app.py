@@ -1,7 +1,12 @@
 import tkinter as tk
 from tkinter import messagebox, ttk
-import datetime
-from models import User
+import hashlib
+import hmac
+import queue
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from models import User, ROLE_TO_TYPE
 from data_sources import SimulatedDataSource
 from data_storage import InMemoryDataStorage
 from detectors import SimpleAnomalyDetector
@@ -10,6 +15,9 @@ from repositories import JsonSettingsRepository
 from controllers import ConfigController, AnomalyController
 from views import MainMonitorView, HistoricalView, AlertsView, SettingsView
 
+# Retraining results kept per (data type, prepared-data version)
+_RETRAIN_CACHE_SIZE = 16
+
 class AnomalyDetectionApp(tk.Tk):
     def __init__(self):
         super().__init__()
@@ -30,8 +38,13 @@ class AnomalyDetectionApp(tk.Tk):
         self.current_user = None
         self.current_view = None
         self.role = None
+        self.allowed_type = ''
         self.views = {}
-        self.last_alerts_view_time = datetime.datetime.now()
+        # Worker threads for view data fetches, keeping the Tk loop free
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        self._retrain_cache: OrderedDict = OrderedDict()
+        # time.monotonic_ns() of the last Alerts view refresh
+        self.last_alerts_view_time = time.monotonic_ns()
         
         # Hardcoded users
         self.users = {
@@ -39,6 +52,9 @@ class AnomalyDetectionApp(tk.Tk):
             'specialist': {'password': 'pass2', 'role': 'equipment'},
             'manager': {'password': 'pass3', 'role': 'fraud'}
         }
+        # Only password digests are kept after startup
+        for user in self.users.values():
+            user['pwhash'] = hashlib.sha256(user.pop('password').encode()).digest()
         self.show_login()
 
     def _configure_styles(self):
@@ -48,6 +64,7 @@ class AnomalyDetectionApp(tk.Tk):
         self.style.configure('TLabel', background='#001f3f', foreground='white')
         self.style.configure('TEntry', fieldbackground='#0a192f', foreground='white')
         self.style.configure('Horizontal.TScale', background='#001f3f')
+        self.style.configure('Treeview', background='#0a192f', fieldbackground='#0a192f', foreground='white')
 
     def show_login(self):
         """Display login screen"""
@@ -69,8 +86,11 @@ class AnomalyDetectionApp(tk.Tk):
         username = self.username_entry.get()
         password = self.password_entry.get()
         
-        if username in self.users and self.users[username]['password'] == password:
-            self.role = self.users[username]['role']
+        record = self.users.get(username)
+        digest = hashlib.sha256(password.encode()).digest()
+        if record is not None and hmac.compare_digest(digest, record['pwhash']):
+            self.role = record['role']
+            self.allowed_type = ROLE_TO_TYPE.get(self.role, '')
             self.current_user = User(username, username, self.role, f"{username}@example.com")
             self.login_frame.destroy()
             self.setup_dependencies()
@@ -94,8 +114,29 @@ class AnomalyDetectionApp(tk.Tk):
 
     def initialize(self):
         """Initialize data source and listeners"""
+        # Samples are produced on the source thread but processed on the Tk thread,
+        # so detection, alerts and views all run on a single writer
+        self._raw_queue = queue.SimpleQueue()
         self.data_source.connect()
-        self.data_source.register_data_listener(self.anomaly_controller.process_new_raw_data)
+        self.data_source.register_data_listener(self._raw_queue.put)
+        self.after(50, self._pump_raw_data)
+
+    def _pump_raw_data(self):
+        """Process the samples queued since the last pump as one batch"""
+        # Read before draining: once the source has stopped, everything it produced is queued
+        finished = not self.data_source.running
+        batch = []
+        try:
+            while True:
+                batch.append(self._raw_queue.get_nowait())
+        except queue.Empty:
+            pass
+        try:
+            if batch:
+                self.anomaly_controller.process_raw_batch(batch)
+        finally:
+            if not (finished and self._raw_queue.empty()):
+                self.after(50, self._pump_raw_data)
 
     def setup_gui(self):
         """Setup the main GUI layout"""
@@ -139,9 +180,13 @@ class AnomalyDetectionApp(tk.Tk):
         
         self.current_view = view
         
-        # Clear current content
+        # Views' own frames are only hidden so they can be shown again; anything else is cleared
+        kept = {getattr(v, 'frame', None) for v in self.views.values()}
         for widget in self.content.winfo_children():
-            widget.destroy()
+            if widget in kept:
+                widget.pack_forget()
+            else:
+                widget.destroy()
         
         # Render new view
         if view in self.views:
@@ -150,21 +195,32 @@ class AnomalyDetectionApp(tk.Tk):
 
     def filter_by_role(self, data_type: str) -> bool:
         """Filter data based on user role"""
-        role_map = {
-            'security': 'traffic',
-            'equipment': 'sensor',
-            'fraud': 'transaction'
-        }
-        return data_type == role_map.get(self.role, '')
+        return data_type == self.allowed_type
 
     def trigger_retraining(self):
         """Trigger model retraining"""
-        historical = self.data_storage.get_historical_data(
-            datetime.datetime.min, datetime.datetime.max
-        )
-        filtered = [d for d in historical if self.filter_by_role(d.data_type)]
-        self.detector.train_model(filtered)
+        allowed = self.allowed_type
+        # Training is deterministic in the stored data, so a repeat on unchanged data reuses the result
+        key = (allowed, self.data_storage.prepared_version)
+        sensitivity = self._retrain_cache.get(key)
+        if sensitivity is not None:
+            self._retrain_cache.move_to_end(key)
+            self.detector.set_global_sensitivity(sensitivity)
+            return
+        features = self.data_storage.get_feature_array(allowed)
+        if not len(features):
+            # Nothing to train on; the current sensitivity is not a training result
+            return
+        self.detector.train_on_features({allowed: features})
+        self._retrain_cache[key] = self.detector.global_sensitivity
+        if len(self._retrain_cache) > _RETRAIN_CACHE_SIZE:
+            self._retrain_cache.popitem(last=False)
 
     def run(self):
         """Start the application"""
-        self.mainloop()
\ No newline at end of file
+        self.mainloop()
+        self.executor.shutdown(wait=False)
+        if self.data_source is not None:
+            self.data_source.disconnect()
+        if self.settings_repo is not None:
+            self.settings_repo.flush()
\ No newline at end of file
@@ -1,17 +1,23 @@
 import datetime
-from typing import List
+from typing import Dict, List
 from interfaces import ISettingsRepository, IDataStorage, IAnomalyDetector, IAlertService
-from models import RawData, PreparedData, DetectionSettings, Anomaly, User
+from models import RawData, PreparedData, DetectionSettings, Anomaly, User, CODE_TO_TYPE
 
 class ConfigController:
     def __init__(self, settings_repo: ISettingsRepository):
         self.settings_repo = settings_repo
+        # Settings are immutable, so cached instances can be shared; saving replaces the entry
+        self._cache: Dict[str, DetectionSettings] = {}
 
     def get_settings_for_user(self, user_id: str) -> DetectionSettings:
-        return self.settings_repo.load_settings(user_id)
+        settings = self._cache.get(user_id)
+        if settings is None:
+            settings = self._cache[user_id] = self.settings_repo.load_settings(user_id)
+        return settings
 
     def save_user_settings(self, settings: DetectionSettings):
         self.settings_repo.save_settings(settings)
+        self._cache[settings.user_id] = settings
 
 class AnomalyController:
     def __init__(self, storage: IDataStorage, detector: IAnomalyDetector, 
@@ -22,16 +28,26 @@ class AnomalyController:
         self.alert_service = alert_service
         self.config_controller = config_controller
         self.user = user
+        self._settings = config_controller.get_settings_for_user(user.user_id)
+
+    def refresh_settings(self):
+        self._settings = self.config_controller.get_settings_for_user(self.user.user_id)
 
     def process_new_raw_data(self, raw_data: RawData):
-        prepared = self.preprocess_data(raw_data)
-        self.storage.store_raw_data(raw_data)
-        self.storage.store_prepared_data(prepared)
-        
-        settings = self.config_controller.get_settings_for_user(self.user.user_id)
-        anomaly = self.detector.detect(prepared, settings)
-        
-        if anomaly:
+        self.process_raw_batch([raw_data])
+
+    def process_raw_batch(self, raw_batch: List[RawData]):
+        """Stores a run of samples and detects anomalies over all of them in one pass"""
+        batch = []
+        for raw_data in raw_batch:
+            try:
+                prepared = self.preprocess_data(raw_data)
+            except ValueError:
+                continue  # an unknown type code must not drop the rest of the batch
+            self.storage.store_raw_data(raw_data)
+            self.storage.store_prepared_data(prepared)
+            batch.append(prepared)
+        for anomaly in self.detector.detect_batch(batch, self._settings):
             self.storage.store_anomaly(anomaly)
             self.alert_service.send_alert(anomaly, self.user)
 
@@ -46,23 +62,8 @@ class AnomalyController:
         self.alert_service.update_alert_status(alert_id, "acknowledged")
 
     def preprocess_data(self, raw_data: RawData) -> PreparedData:
-        data_type = raw_data.attributes.get('type', '')
-        features = []
-        type_str = ''
-        
-        if data_type == '1':
-            temp = float(raw_data.attributes.get('temperature', '0'))
-            features = [temp]
-            type_str = 'sensor'
-        elif data_type == '2':
-            time_of_day = float(raw_data.attributes.get('time_of_day', '0'))
-            features = [time_of_day]
-            type_str = 'transaction'
-        elif data_type == '3':
-            volume = float(raw_data.attributes.get('volume', '0'))
-            features = [volume]
-            type_str = 'traffic'
-        else:
+        type_str = CODE_TO_TYPE.get(raw_data.type_code)
+        if type_str is None:
             raise ValueError("Unknown data type")
         
-        return PreparedData(raw_data.id, raw_data.timestamp, type_str, features)
\ No newline at end of file
+        return PreparedData(raw_data.id, raw_data.timestamp, type_str, [raw_data.value])
\ No newline at end of file
@@ -1,11 +1,15 @@
 import datetime
-import uuid
-import random
+import itertools
 import threading
 import time
+from random import choice, randint, uniform
 from typing import Optional, Callable
 from interfaces import IDataSource
-from models import RawData
+from models import RawData, TYPE_CODES, CODE_TO_TYPE
+
+_data_ids = itertools.count(int(time.time() * 1e6))
+_TYPE_CODES = tuple(CODE_TO_TYPE)
+_DEVICES = (True, False)
 
 class SimulatedDataSource(IDataSource):
     def __init__(self):
@@ -13,12 +17,18 @@ class SimulatedDataSource(IDataSource):
         self.running = False
         self.current_timestamp = datetime.datetime(2025, 1, 1)
         self.generated_count = 0
+        self._stop = threading.Event()
 
     def connect(self) -> bool:
         self.running = True
+        self._stop.clear()
         threading.Thread(target=self.generate_loop, daemon=True).start()
         return True
 
+    def disconnect(self):
+        self.running = False
+        self._stop.set()
+
     def get_next_data_chunk(self) -> RawData:
         return self.generate_one_data()
 
@@ -26,29 +36,35 @@ class SimulatedDataSource(IDataSource):
         self.listener = callback
 
     def generate_loop(self):
-        while self.running and self.generated_count < 300:
+        # Absolute 1-second schedule: generation time does not accumulate as drift
+        deadline = time.monotonic()
+        while not self._stop.is_set() and self.generated_count < 300:
             raw = self.generate_one_data()
-            if self.listener:
-                self.listener(raw)
+            listener = self.listener
+            if listener:
+                listener(raw)
             self.generated_count += 1
-            time.sleep(1)
+            deadline += 1.0
+            if self._stop.wait(max(0.0, deadline - time.monotonic())):
+                break
+        # Cleared only after the last sample was handed to the listener
+        self.running = False
 
     def generate_one_data(self) -> RawData:
-        data_id = str(uuid.uuid4())
+        data_id = f"d{next(_data_ids)}"
         timestamp = self.current_timestamp
-        source = f"source_{random.randint(1, 10)}"
-        attributes = {}
-        type_ = str(random.choice([1, 2, 3]))
-        attributes['type'] = type_
+        source = f"source_{randint(1, 10)}"
+        type_code = choice(_TYPE_CODES)
+        extra = None
         
-        if type_ == '1':
-            attributes['temperature'] = str(random.uniform(0, 200))
-        elif type_ == '2':
-            attributes['time_of_day'] = str(random.uniform(0, 24))
-            attributes['used_device'] = str(random.choice([True, False]))
-        elif type_ == '3':
-            attributes['volume'] = str(random.uniform(0, 2000))
-            attributes['ip'] = f"192.168.{random.randint(0,255)}.{random.randint(0,255)}"
+        if type_code == TYPE_CODES['sensor']:
+            value = uniform(0, 200)
+        elif type_code == TYPE_CODES['transaction']:
+            value = uniform(0, 24)
+            extra = (choice(_DEVICES),)
+        else:
+            value = uniform(0, 2000)
+            extra = (f"192.168.{randint(0,255)}.{randint(0,255)}",)
         
         self.current_timestamp += datetime.timedelta(hours=1)
-        return RawData(data_id, timestamp, source, attributes)
\ No newline at end of file
+        return RawData(data_id, timestamp, source, type_code, value, extra)
\ No newline at end of file
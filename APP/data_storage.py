@@ -1,40 +1,160 @@
+import bisect
 import datetime
-from typing import List, Optional
-from collections import defaultdict
+import threading
+from typing import Deque, Dict, List, Optional, Tuple
+from collections import Counter, defaultdict, deque
+import numpy as np
 from interfaces import IDataStorage
-from models import RawData, PreparedData, Anomaly
+from models import RawData, PreparedData, Anomaly, ROLE_TO_TYPE, TYPE_CODES
 
-class InMemoryDataStorage(IDataStorage):
+_TRAFFIC_CODE = TYPE_CODES['traffic']
+
+class _DailyAggregate:
+    """Running per-day sum and count of values, per data type"""
     def __init__(self):
-        self.raw_data: List[RawData] = []
+        self._sum: Dict[Tuple[str, datetime.date], float] = defaultdict(float)
+        self._count: Dict[Tuple[str, datetime.date], int] = defaultdict(int)
+        self._days: Dict[str, List[datetime.date]] = defaultdict(list)
+
+    def add(self, data_type: str, day: datetime.date, value: float):
+        key = (data_type, day)
+        if not self._count[key]:
+            bisect.insort(self._days[data_type], day)
+        self._sum[key] += value
+        self._count[key] += 1
+
+    def remove(self, data_type: str, day: datetime.date, value: float):
+        key = (data_type, day)
+        self._count[key] -= 1
+        if self._count[key]:
+            self._sum[key] -= value
+        else:
+            del self._sum[key], self._count[key]
+            days = self._days[data_type]
+            del days[bisect.bisect_left(days, day)]
+
+    def averages(self, data_type: str) -> Tuple[List[datetime.date], List[float]]:
+        days = list(self._days.get(data_type, ()))
+        return days, [self._sum[(data_type, day)] / self._count[(data_type, day)] for day in days]
+
+
+class InMemoryDataStorage(IDataStorage):
+    def __init__(self, capacity: int = 10_000):
+        self._lock = threading.Lock()
+        self.capacity = capacity
+        # Bumped on every mutation so views can skip redraws when nothing changed
+        self.version = 0
+        # Bumped only when an anomaly is stored; raw samples arrive every second and do not touch it
+        self.anomalies_version = 0
+        # Bumped only when a prepared sample is stored; the training features change with it alone
+        self.prepared_version = 0
+        # Only the most recent `capacity` samples are kept
+        self.raw_data: Deque[RawData] = deque(maxlen=capacity)
+        # Live prepared samples are prepared_data[_start:]; the evicted prefix is cut off once it
+        # reaches capacity, so eviction stays amortized O(1) and lookups bisect a plain list
         self.prepared_data: List[PreparedData] = []
-        self.anomalies: List[Anomaly] = []
+        self._prepared_ts: List[datetime.datetime] = []
+        self._start = 0
+        # Source IPs of the traffic samples currently in raw_data
+        self._ip_counts: Counter = Counter()
+        # Ring buffer of (type code, first feature) for the same window, consumed by training;
+        # float32 is ample precision for fitting a sensitivity and halves the column
+        self._ring_type = np.zeros(capacity, dtype=np.uint8)
+        self._ring_feat = np.zeros(capacity, dtype=np.float32)
+        self._head = 0
+        self._count = 0
+        self._daily_features = _DailyAggregate()
+        self._anomaly_index: Dict[str, Anomaly] = {}
+        # Anomalies bucketed by data type, each bucket sorted by detection_time
+        self._by_type: Dict[str, List[Anomaly]] = defaultdict(list)
+        self._times_by_type: Dict[str, List[datetime.datetime]] = defaultdict(list)
+        self._daily_anomaly_scores = _DailyAggregate()
 
     def store_raw_data(self, data: RawData):
-        self.raw_data.append(data)
+        with self._lock:
+            self.version += 1
+            if len(self.raw_data) == self.capacity:
+                evicted = self.raw_data[0]
+                if evicted.type_code == _TRAFFIC_CODE and evicted.extra:
+                    ip = evicted.extra[0]
+                    self._ip_counts[ip] -= 1
+                    if not self._ip_counts[ip]:
+                        del self._ip_counts[ip]
+            if data.type_code == _TRAFFIC_CODE and data.extra:
+                self._ip_counts[data.extra[0]] += 1
+            self.raw_data.append(data)
 
     def store_prepared_data(self, data: PreparedData):
-        self.prepared_data.append(data)
+        with self._lock:
+            self.version += 1
+            self.prepared_version += 1
+            if len(self.prepared_data) - self._start == self.capacity:
+                evicted = self.prepared_data[self._start]
+                self._daily_features.remove(evicted.data_type, evicted.timestamp.date(),
+                                            evicted.features[0])
+                self._start += 1
+                if self._start == self.capacity:
+                    del self.prepared_data[:self._start], self._prepared_ts[:self._start]
+                    self._start = 0
+            self._daily_features.add(data.data_type, data.timestamp.date(), data.features[0])
+            # Samples are assumed to arrive in timestamp order (the source emits them so):
+            # the window, its timestamps and the training ring then all evict the same oldest record
+            self._prepared_ts.append(data.timestamp)
+            self.prepared_data.append(data)
+            self._ring_type[self._head] = TYPE_CODES.get(data.data_type, 0)
+            self._ring_feat[self._head] = data.features[0]
+            self._head = (self._head + 1) % self.capacity
+            self._count = min(self._count + 1, self.capacity)
 
     def get_historical_data(self, start_time: datetime.datetime, 
                            end_time: datetime.datetime) -> List[PreparedData]:
-        return [d for d in self.prepared_data if start_time <= d.timestamp <= end_time]
+        with self._lock:
+            lo = bisect.bisect_left(self._prepared_ts, start_time, self._start)
+            hi = bisect.bisect_right(self._prepared_ts, end_time, lo)
+            return self.prepared_data[lo:hi]
+
+    def get_feature_array(self, data_type: str) -> np.ndarray:
+        with self._lock:
+            count = self._count
+            mask = self._ring_type[:count] == TYPE_CODES.get(data_type, 0)
+            return self._ring_feat[:count][mask]
+
+    def get_daily_averages(self, role: str) -> Tuple[List[datetime.date], List[float]]:
+        with self._lock:
+            return self._daily_features.averages(ROLE_TO_TYPE.get(role, ''))
+
+    def get_daily_anomaly_averages(self, role: str) -> Dict[datetime.date, float]:
+        with self._lock:
+            return dict(zip(*self._daily_anomaly_scores.averages(ROLE_TO_TYPE.get(role, ''))))
+
+    def get_top_ips(self, n: int = 10) -> List[Tuple[str, int]]:
+        with self._lock:
+            return self._ip_counts.most_common(n)
 
     def store_anomaly(self, anomaly: Anomaly):
-        self.anomalies.append(anomaly)
+        with self._lock:
+            self.version += 1
+            self.anomalies_version += 1
+            self._anomaly_index[anomaly.anomaly_id] = anomaly
+            times = self._times_by_type[anomaly.data_type]
+            index = bisect.bisect_right(times, anomaly.detection_time)
+            times.insert(index, anomaly.detection_time)
+            self._by_type[anomaly.data_type].insert(index, anomaly)
+            self._daily_anomaly_scores.add(anomaly.data_type, anomaly.detection_date,
+                                           anomaly.score)
 
     def get_anomalies(self, role: str, 
                      start_time: datetime.datetime = datetime.datetime.min,
                      end_time: datetime.datetime = datetime.datetime.max) -> List[Anomaly]:
-        role_map = {
-            'security': 'traffic',
-            'equipment': 'sensor',
-            'fraud': 'transaction'
-        }
-        allowed_type = role_map.get(role, '')
-        return [a for a in self.anomalies 
-                if a.description.startswith(allowed_type + ":") 
-                and start_time <= a.detection_time <= end_time]
+        allowed_type = ROLE_TO_TYPE.get(role, '')
+        with self._lock:
+            candidates = self._by_type.get(allowed_type)
+            if not candidates:
+                return []
+            times = self._times_by_type[allowed_type]
+            lo = bisect.bisect_left(times, start_time)
+            hi = bisect.bisect_right(times, end_time)
+            return candidates[lo:hi]
 
     def get_anomaly(self, anomaly_id: str) -> Optional[Anomaly]:
-        return next((a for a in self.anomalies if a.anomaly_id == anomaly_id), None)
\ No newline at end of file
+        return self._anomaly_index.get(anomaly_id)
\ No newline at end of file
@@ -1,25 +1,64 @@
-import uuid
-from typing import List, Optional
+import itertools
+import time
+from typing import Dict, List, Optional
+import numpy as np
 from interfaces import IAnomalyDetector
-from models import PreparedData, DetectionSettings, Anomaly
+from models import PreparedData, DetectionSettings, Anomaly, TYPE_CODES
+
+_EMPTY = np.empty(0)
+_anomaly_ids = itertools.count(int(time.time() * 1e6))
+
+def _feature_array(historical_data: List[PreparedData], data_type: str) -> np.ndarray:
+    return np.fromiter((d.features[0] for d in historical_data if d.data_type == data_type),
+                       dtype=np.float64)
+
+def _transaction_mask(time_vals: np.ndarray, s: float) -> np.ndarray:
+    # Vectorized form of the 'transaction' branch of detect: anomaly when score > 100
+    lower = s * 8.0
+    upper = s * 22.0 + (1 - s * 2.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        below = np.where(time_vals > 0, (lower / time_vals) * 100, 200.0)
+        above = (time_vals / upper) * 100
+    score = np.where(time_vals < lower, below, np.where(time_vals > upper, above, 0.0))
+    return score > 100
 
 class SimpleAnomalyDetector(IAnomalyDetector):
     def __init__(self):
         self.global_sensitivity: float = 0.5
+        # data_type -> check of a single sample at sensitivity s
+        self._handlers = {
+            'sensor': self._detect_sensor,
+            'traffic': self._detect_traffic,
+            'transaction': self._detect_transaction,
+        }
 
     def train_model(self, historical_data: List[PreparedData]):
         if not historical_data:
             return
 
+        self.train_on_features({data_type: _feature_array(historical_data, data_type)
+                                for data_type in ('sensor', 'traffic', 'transaction')})
+
+    def train_on_features(self, features: Dict[str, np.ndarray]):
+        """Features are first-feature arrays keyed by data type; missing types count as empty"""
+        # Sorted once, so each bisection step counts with searchsorted instead of a full scan
+        sensor = np.sort(features.get('sensor', _EMPTY))
+        traffic = np.sort(features.get('traffic', _EMPTY))
+        transaction = np.sort(features.get('transaction', _EMPTY))
+        total = len(sensor) + len(traffic) + len(transaction)
+        if not total:
+            return
+
         def count_anomalies(s: float) -> int:
-            settings = DetectionSettings("default_user", s, ["any"])
-            count = 0
-            for data in historical_data:
-                if self.detect(data, settings):
-                    count += 1
-            return count
-
-        target = len(historical_data) // 2
+            # A transaction scores above 100 exactly when it falls outside [lower, upper]
+            lower = s * 8.0
+            upper = s * 22.0 + (1 - s * 2.0)
+            return int(len(sensor) - np.searchsorted(sensor, (1.1 - s) * 150.0, 'right')
+                       + len(traffic) - np.searchsorted(traffic, (1.1 - s) * 1000.0, 'right')
+                       + np.searchsorted(transaction, lower, 'left')
+                       + len(transaction) - np.searchsorted(transaction, upper, 'right'))
+
+        target = total // 2
         low, high = 0.0, 1.0
         for _ in range(20):  # Binary search
             mid = (low + high) / 2
@@ -32,43 +71,71 @@ class SimpleAnomalyDetector(IAnomalyDetector):
 
     def detect(self, data: PreparedData, settings: DetectionSettings) -> Optional[Anomaly]:
         s = settings.sensitivity if settings.sensitivity is not None else self.global_sensitivity
-        
-        if data.data_type == 'sensor':
-            temp = data.features[0]
-            threshold = (1.1 - s) * 150
-            if temp > threshold:
-                score = (temp / threshold) * 100
-                desc = f"sensor: Temperature {temp} exceeds threshold {threshold}"
-                severity = "high" if score > 150 else "medium"
-                return Anomaly(str(uuid.uuid4()), data.id, data.timestamp, score, desc, severity)
-        
-        elif data.data_type == 'traffic':
-            volume = data.features[0]
-            threshold = (1.1 - s) * 1000
-            if volume > threshold:
-                score = (volume / threshold) * 100
-                desc = f"traffic: Volume {volume} exceeds threshold {threshold}"
-                severity = "high" if score > 150 else "medium"
-                return Anomaly(str(uuid.uuid4()), data.id, data.timestamp, score, desc, severity)
-        
-        elif data.data_type == 'transaction':
-            time_val = data.features[0]
-            lower = s * 8.0
-            upper = s * 22.0 + (1 - s * 2.0)
-            score = 0.0
-            desc = ""
-            if time_val < lower:
-                score = (lower / time_val) * 100 if time_val > 0 else 200.0
-                desc = f"transaction: Time {time_val} below lower bound {lower}"
-            elif time_val > upper:
-                score = (time_val / upper) * 100
-                desc = f"transaction: Time {time_val} above upper bound {upper}"
-            
-            if score > 100:
-                severity = "high" if score > 150 else "medium"
-                return Anomaly(str(uuid.uuid4()), data.id, data.timestamp, score, desc, severity)
-        
-        return None
+        return self._detect_core(data, s)
+
+    def _detect_core(self, data: PreparedData, s: float) -> Optional[Anomaly]:
+        handler = self._handlers.get(data.data_type)
+        return handler(data, s) if handler is not None else None
+
+    def _detect_sensor(self, data: PreparedData, s: float) -> Optional[Anomaly]:
+        temp = data.features[0]
+        threshold = (1.1 - s) * 150
+        if temp <= threshold:
+            return None
+        score = (temp / threshold) * 100
+        desc = f"sensor: Temperature {temp} exceeds threshold {threshold}"
+        return self._make_anomaly(data, score, desc)
+
+    def _detect_traffic(self, data: PreparedData, s: float) -> Optional[Anomaly]:
+        volume = data.features[0]
+        threshold = (1.1 - s) * 1000
+        if volume <= threshold:
+            return None
+        score = (volume / threshold) * 100
+        desc = f"traffic: Volume {volume} exceeds threshold {threshold}"
+        return self._make_anomaly(data, score, desc)
+
+    def _detect_transaction(self, data: PreparedData, s: float) -> Optional[Anomaly]:
+        time_val = data.features[0]
+        lower = s * 8.0
+        upper = s * 22.0 + (1 - s * 2.0)
+        if time_val < lower:
+            score = (lower / time_val) * 100 if time_val > 0 else 200.0
+            desc = f"transaction: Time {time_val} below lower bound {lower}"
+        elif time_val > upper:
+            score = (time_val / upper) * 100
+            desc = f"transaction: Time {time_val} above upper bound {upper}"
+        else:
+            return None
+        if score <= 100:
+            return None
+        return self._make_anomaly(data, score, desc)
+
+    @staticmethod
+    def _make_anomaly(data: PreparedData, score: float, desc: str) -> Anomaly:
+        severity = "high" if score > 150 else "medium"
+        return Anomaly(f"a{next(_anomaly_ids)}", data.id, data.timestamp, score, desc, severity,
+                       data.data_type)
+
+    def detect_batch(self, batch: List[PreparedData], settings: DetectionSettings) -> List[Anomaly]:
+        if not batch:
+            return []
+        s = settings.sensitivity if settings.sensitivity is not None else self.global_sensitivity
+        values = np.fromiter((d.features[0] for d in batch), dtype=np.float64, count=len(batch))
+        codes = np.fromiter((TYPE_CODES.get(d.data_type, 0) for d in batch), dtype=np.int8,
+                            count=len(batch))
+
+        mask = np.zeros(len(batch), dtype=bool)
+        sensor = codes == TYPE_CODES['sensor']
+        mask[sensor] = values[sensor] > (1.1 - s) * 150.0
+        traffic = codes == TYPE_CODES['traffic']
+        mask[traffic] = values[traffic] > (1.1 - s) * 1000.0
+        transaction = codes == TYPE_CODES['transaction']
+        mask[transaction] = _transaction_mask(values[transaction], s)
+
+        # Anomaly objects are only built for the flagged samples
+        anomalies = (self._detect_core(batch[i], s) for i in np.flatnonzero(mask))
+        return [a for a in anomalies if a is not None]
 
     def set_global_sensitivity(self, sensitivity: float):
         self.global_sensitivity = sensitivity
\ No newline at end of file
@@ -1,7 +1,7 @@
 import abc
 from typing import List, Optional, Callable
 import datetime
-from models import RawData, PreparedData, DetectionSettings, Anomaly, User
+from models import RawData, PreparedData, DetectionSettings, Anomaly, User, Alert
 
 class ISettingsRepository(abc.ABC):
     @abc.abstractmethod
@@ -21,6 +21,10 @@ class IAnomalyDetector(abc.ABC):
     def detect(self, data: PreparedData, settings: DetectionSettings) -> Optional[Anomaly]:
         pass
 
+    def detect_batch(self, batch: List[PreparedData], settings: DetectionSettings) -> List[Anomaly]:
+        anomalies = (self.detect(data, settings) for data in batch)
+        return [a for a in anomalies if a is not None]
+
     @abc.abstractmethod
     def set_global_sensitivity(self, sensitivity: float):
         pass
@@ -44,6 +48,10 @@ class IDataSource(abc.ABC):
     def connect(self) -> bool:
         pass
 
+    @abc.abstractmethod
+    def disconnect(self):
+        pass
+
     @abc.abstractmethod
     def get_next_data_chunk(self) -> RawData:
         pass
@@ -54,7 +62,7 @@ class IDataSource(abc.ABC):
 
 class IAlertService(abc.ABC):
     @abc.abstractmethod
-    def send_alert(self, anomaly: Anomaly, user: User):
+    def send_alert(self, anomaly: Anomaly, user: User) -> Alert:
         pass
 
     @abc.abstractmethod
@@ -1,29 +1,42 @@
 import datetime
-from dataclasses import dataclass
-from typing import Dict, List, Optional
+from dataclasses import dataclass, field
+from typing import Dict, Final, List, Optional, Tuple
 
-@dataclass
+# User role -> data type monitored by that role
+ROLE_TO_TYPE: Final[Dict[str, str]] = {
+    'security': 'traffic',
+    'equipment': 'sensor',
+    'fraud': 'transaction'
+}
+
+# PreparedData.data_type -> RawData.type_code; the single source of the numeric codes
+TYPE_CODES: Final[Dict[str, int]] = {'sensor': 1, 'transaction': 2, 'traffic': 3}
+CODE_TO_TYPE: Final[Dict[int, str]] = {code: data_type for data_type, code in TYPE_CODES.items()}
+
+@dataclass(slots=True, frozen=True, eq=False)
 class RawData:
     id: str
     timestamp: datetime.datetime
     source: str
-    attributes: Dict[str, str]
+    type_code: int  # see TYPE_CODES
+    value: float
+    extra: Optional[Tuple] = None  # (used_device,) for transactions, (ip,) for traffic
 
-@dataclass
+@dataclass(slots=True, frozen=True, eq=False)
 class PreparedData:
     id: str
     timestamp: datetime.datetime
     data_type: str
     features: List[float]
 
-@dataclass
+@dataclass(slots=True, frozen=True, eq=False)
 class User:
     user_id: str
     username: str
     role: str
     email: str
 
-@dataclass
+@dataclass(slots=True, frozen=True, eq=False)
 class Anomaly:
     anomaly_id: str
     data_id: str
@@ -31,16 +44,23 @@ class Anomaly:
     score: float
     description: str
     severity: str
+    data_type: str
+    # Derived once at creation; used for per-day aggregation
+    detection_date: datetime.date = field(init=False, repr=False)
 
-@dataclass
+    def __post_init__(self):
+        object.__setattr__(self, 'detection_date', self.detection_time.date())
+
+@dataclass(slots=True)
 class Alert:
     alert_id: str
     anomaly_id: str
     time_raised: datetime.datetime
-    message: str
+    username: str
     status: str
+    data_type: str
 
-@dataclass
+@dataclass(slots=True, frozen=True, eq=False)
 class DetectionSettings:
     user_id: str
     sensitivity: float  # 0.0 to 1.0
@@ -1,25 +1,76 @@
 import json
 import os
+import threading
+import time
+from typing import Dict
 from interfaces import ISettingsRepository
 from models import DetectionSettings
 
 class JsonSettingsRepository(ISettingsRepository):
-    def __init__(self, file_path="settings.json"):
+    def __init__(self, file_path="settings.json", flush_delay: float = 2.0):
         self.file_path = file_path
+        self.flush_delay = flush_delay
         self.settings_dict = {}
         if os.path.exists(file_path):
             with open(file_path, 'r') as f:
                 self.settings_dict = json.load(f)
+        self._cache: Dict[str, DetectionSettings] = {}
+        self._dirty = False
+        # Bumped by every save; a flush only marks the repository clean if no save came in meanwhile
+        self._generation = 0
+        self._last_written_hash = hash(json.dumps(self.settings_dict, separators=(',', ':')))
+        self._cv = threading.Condition()
+        # Serializes flushes; save_settings never takes it, so saves do not wait on disk I/O
+        self._write_lock = threading.Lock()
+        threading.Thread(target=self._writer_loop, daemon=True).start()
 
     def load_settings(self, user_id: str) -> DetectionSettings:
-        data = self.settings_dict.get(user_id, 
-                                     {"sensitivity": 0.5, "monitored_sources": ["any"]})
-        return DetectionSettings(user_id, data["sensitivity"], data["monitored_sources"])
+        settings = self._cache.get(user_id)
+        if settings is None:
+            data = self.settings_dict.get(user_id, 
+                                         {"sensitivity": 0.5, "monitored_sources": ["any"]})
+            settings = DetectionSettings(user_id, data["sensitivity"], data["monitored_sources"])
+            self._cache[user_id] = settings
+        return settings
 
     def save_settings(self, settings: DetectionSettings):
-        self.settings_dict[settings.user_id] = {
-            "sensitivity": settings.sensitivity,
-            "monitored_sources": settings.monitored_sources
-        }
-        with open(self.file_path, 'w') as f:
-            json.dump(self.settings_dict, f)
\ No newline at end of file
+        with self._cv:
+            self.settings_dict[settings.user_id] = {
+                "sensitivity": settings.sensitivity,
+                "monitored_sources": settings.monitored_sources
+            }
+            self._cache[settings.user_id] = settings
+            self._generation += 1
+            self._dirty = True
+            self._cv.notify()
+
+    def flush(self):
+        with self._write_lock:
+            with self._cv:
+                if not self._dirty:
+                    return
+                generation = self._generation
+                content = json.dumps(self.settings_dict, separators=(',', ':'))
+            content_hash = hash(content)
+            if content_hash != self._last_written_hash:
+                tmp_path = self.file_path + ".tmp"
+                with open(tmp_path, 'w') as f:
+                    f.write(content)
+                os.replace(tmp_path, self.file_path)
+                self._last_written_hash = content_hash
+            # Cleared only once the file is in place and still current, so failed or
+            # superseded writes are retried
+            with self._cv:
+                if self._generation == generation:
+                    self._dirty = False
+
+    def _writer_loop(self):
+        while True:
+            with self._cv:
+                while not self._dirty:
+                    self._cv.wait()
+            time.sleep(self.flush_delay)  # coalesce saves that arrive close together
+            try:
+                self.flush()
+            except OSError:
+                pass  # still dirty; retried on the next pass
@@ -1,25 +1,33 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
+import dataclasses
 import datetime
-from collections import defaultdict, Counter
+import time
+import numpy as np
+import matplotlib as mpl
+import matplotlib.dates as mdates
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
 from interfaces import IView
-from models import Anomaly
+from models import Alert, Anomaly
+
+# Стиль 'fast': упрощение путей и отрисовка длинных линий чанками
+mpl.style.use('fast')
+
+# Период обновления представлений; без изменений данных опрос идёт реже
+_REFRESH_MS = 1000
+_IDLE_REFRESH_MS = 2000
 
 # Диалог подтверждения аномалии
 class AnomalyConfirmationDialog:
+    _LABEL_STYLE = {'bg': '#001f3f', 'fg': 'white'}
+
     def __init__(self, app, anomaly: Anomaly):
         self.app = app
         self.anomaly = anomaly
-        alerts = self.app.alert_service.get_alerts()
-        self.alert = next((al for al in alerts if al.anomaly_id == anomaly.anomaly_id), None)
-        
-        if self.alert is None:
-            self.app.alert_service.send_alert(anomaly, self.app.current_user)
-            alerts = self.app.alert_service.get_alerts()
-            self.alert = next((al for al in alerts if al.anomaly_id == anomaly.anomaly_id), None)
+        # Оповещение создаётся только при решении пользователя, а не при открытии диалога
+        self.alert = self.app.alert_service.get_alert_by_anomaly(anomaly.anomaly_id)
         
         self.win = tk.Toplevel(self.app)
         self.win.title("Anomaly Details")
@@ -28,18 +36,24 @@ class AnomalyConfirmationDialog:
 
     def build_ui(self):
         a = self.anomaly
-        tk.Label(self.win, text=f"ID: {a.anomaly_id}", bg='#001f3f', fg="white").pack(anchor='w', padx=10, pady=2)
-        tk.Label(self.win, text=f"Data ID: {a.data_id}", bg='#001f3f', fg="white").pack(anchor='w', padx=10, pady=2)
-        tk.Label(self.win, text=f"Detection Time: {a.detection_time}", bg='#001f3f', fg="white").pack(anchor='w', padx=10, pady=2)
-        tk.Label(self.win, text=f"Score: {a.score}", bg='#001f3f', fg="white").pack(anchor='w', padx=10, pady=2)
-        tk.Label(self.win, text=f"Description: {a.description}", bg='#001f3f', fg="white", 
-                wraplength=500, justify='left').pack(anchor='w', padx=10, pady=2)
-        tk.Label(self.win, text=f"Severity: {a.severity}", bg='#001f3f', fg="white").pack(anchor='w', padx=10, pady=6)
-        
-        status_text = self.alert.status if self.alert is not None else "no alert"
-        self.status_label = tk.Label(self.win, text=f"Alert status: {status_text}", 
-                                    bg='#001f3f', fg="white")
-        self.status_label.pack(padx=10, pady=4)
+        fields = (
+            ("ID", a.anomaly_id),
+            ("Data ID", a.data_id),
+            ("Detection Time", a.detection_time),
+            ("Score", a.score),
+            ("Description", a.description),
+            ("Severity", a.severity),
+        )
+        # Поля собираются в ещё не упакованном фрейме, который размещается в окне один раз
+        details = tk.Frame(self.win, bg='#001f3f')
+        for name, value in fields:
+            tk.Label(details, text=f"{name}: {value}", wraplength=500, justify='left',
+                     **self._LABEL_STYLE).pack(anchor='w', pady=2)
+        details.pack(fill='x', padx=10)
+        
+        status_text = self.alert.status if self.alert is not None else "not yet raised"
+        self.status_label = tk.Label(self.win, text=f"Alert status: {status_text}", **self._LABEL_STYLE)
+        self.status_label.pack(padx=10, pady=(8, 4))
         
         btn_frame = tk.Frame(self.win, bg='#001f3f')
         btn_frame.pack(pady=8, padx=10, fill='x')
@@ -59,23 +73,17 @@ class AnomalyConfirmationDialog:
 
     def confirm(self):
         if self.alert is None:
-            self.app.alert_service.send_alert(self.anomaly, self.app.current_user)
-            alerts = self.app.alert_service.get_alerts()
-            self.alert = next((al for al in alerts if al.anomaly_id == self.anomaly.anomaly_id), None)
+            self.alert = self.app.alert_service.send_alert(self.anomaly, self.app.current_user)
         
         if self.alert:
             self.app.alert_service.update_alert_status(self.alert.alert_id, 'confirmed')
             self.status_label.config(text=f"Alert status: confirmed")
             messagebox.showinfo("Confirmed", "Anomaly confirmed.")
-            if self.app.current_view in ['Alerts', 'Historical Analysis', 'Dashboard']:
-                self.app.switch_view(self.app.current_view)
             self.win.destroy()
 
     def false_positive(self):
         if self.alert is None:
-            self.app.alert_service.send_alert(self.anomaly, self.app.current_user)
-            alerts = self.app.alert_service.get_alerts()
-            self.alert = next((al for al in alerts if al.anomaly_id == self.anomaly.anomaly_id), None)
+            self.alert = self.app.alert_service.send_alert(self.anomaly, self.app.current_user)
         
         if self.alert:
             self.app.alert_service.update_alert_status(self.alert.alert_id, 'false_positive')
@@ -84,8 +92,6 @@ class AnomalyConfirmationDialog:
             except Exception:
                 pass
             messagebox.showinfo("Marked", "Anomaly marked as false positive.")
-            if self.app.current_view in ['Alerts', 'Historical Analysis', 'Dashboard']:
-                self.app.switch_view(self.app.current_view)
             self.win.destroy()
 
 # Основное представление дашборда
@@ -98,10 +104,18 @@ class MainMonitorView(IView):
         self.canvas2 = None
         self.ax2 = None
         self.update_id = None
+        self._data_version = None
+        # Все виджеты дашборда живут в одном фрейме, который при смене представления
+        # только скрывается, поэтому Figure и canvas создаются один раз
+        self.frame = None
+        # Сбрасывается событием <Destroy> фрейма, без опроса winfo_exists
+        self._widgets_alive = False
 
     def render(self):
-        tk.Label(self.app.content, text="Dashboard - Current Anomalies", 
-                font=("Arial", 16), bg="#001f3f", fg="white").pack(pady=10)
+        if self._widgets_alive:
+            self.frame.pack(fill=tk.BOTH, expand=True)
+            self.canvas.draw_idle()
+            self._data_version = None
         self.update_graphs()
 
     def stop_update(self):
@@ -113,151 +127,203 @@ class MainMonitorView(IView):
         if self.app.current_view != self.get_view_name():
             return
         
-        # Проверка и сброс виджетов при необходимости
-        try:
-            if getattr(self, 'anomaly_list', None) is not None:
-                if not self.anomaly_list.winfo_exists():
-                    self._reset_widgets()
-        except tk.TclError:
-            self._reset_widgets()
+        # Отмена уже запланированного обновления, чтобы не плодить цепочки таймеров
+        self.stop_update()
         
-        # Создание виджетов графиков если нужно
-        if not self.canvas:
+        # Пересоздание виджетов, если прежние уничтожены при смене представления
+        if not self._widgets_alive:
+            self._reset_widgets()
             self._create_widgets()
+            self._data_version = None
         
-        # Обновление данных и графиков
+        # Обновление данных и графиков только при изменении хранилища
+        version = self.app.data_storage.version
+        if version == self._data_version:
+            self.update_id = self.app.after(_IDLE_REFRESH_MS, self.update_graphs)
+            return
         self._update_data_and_charts()
+        self._data_version = version
         
         # Планирование следующего обновления
-        self.update_id = self.app.after(1000, self.update_graphs)
+        self.update_id = self.app.after(_REFRESH_MS, self.update_graphs)
 
     def _reset_widgets(self):
         """Сброс виджетов"""
+        self._widgets_alive = False
+        self.frame = None
         self.canvas = None
         self.canvas2 = None
         self.anomaly_list = None
         self.ax = None
         self.ax2 = None
 
+    def _on_widgets_destroyed(self, event):
+        self._widgets_alive = False
+
     def _create_widgets(self):
         """Создание виджетов графиков"""
+        self.frame = tk.Frame(self.app.content, bg='#001f3f')
+        self.frame.pack(fill=tk.BOTH, expand=True)
+        self.frame.bind('<Destroy>', self._on_widgets_destroyed)
+        self._widgets_alive = True
+        tk.Label(self.frame, text="Dashboard - Current Anomalies", 
+                font=("Arial", 16), bg="#001f3f", fg="white").pack(pady=10)
+        
         self.fig = Figure(figsize=(6, 4), dpi=100, facecolor='#001f3f')
         self.ax = self.fig.add_subplot(111)
-        self.canvas = FigureCanvasTkAgg(self.fig, master=self.app.content)
+        self._setup_main_axes()
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self.frame)
         self.canvas.get_tk_widget().pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self._bg = None
+        self.canvas.mpl_connect('draw_event', self._on_draw)
 
         if self.app.role == 'security':
             self.fig2 = Figure(figsize=(6, 4), dpi=100, facecolor='#001f3f')
             self.ax2 = self.fig2.add_subplot(111)
-            self.canvas2 = FigureCanvasTkAgg(self.fig2, master=self.app.content)
+            self.canvas2 = FigureCanvasTkAgg(self.fig2, master=self.frame)
             self.canvas2.get_tk_widget().pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+            self._setup_ip_axes()
+            self._last_top_ips = None
+            self._ip_bars = None
 
-        list_frame = tk.Frame(self.app.content, bg='#001f3f')
+        list_frame = tk.Frame(self.frame, bg='#001f3f')
         list_frame.pack(side=tk.RIGHT, fill=tk.Y)
         tk.Label(list_frame, text="Anomalies", font=("Arial", 12), 
                 bg='#001f3f', fg="white").pack()
         self.anomaly_list = tk.Listbox(list_frame, height=20, width=50, 
                                       bg='#0a192f', fg="white", selectbackground="cyan")
         self.anomaly_list.pack()
+        self._list_anomalies = []
+
+    def _setup_main_axes(self):
+        """Статичное оформление основного графика; линия и точки обновляются блиттингом"""
+        self.ax.xaxis_date()
+        self.line, = self.ax.plot([], [], label='Avg Feature', color='cyan', animated=True)
+        self.scatter = self.ax.scatter([], [], color='red', label='Avg Anomaly Score', animated=True)
+        
+        self.ax.set_xlabel("Day")
+        self.ax.set_ylabel("Value")
+        self.ax.set_facecolor('#001f3f')
+        self.ax.tick_params(colors='white')
+        self.ax.tick_params(axis='x', labelrotation=45)
+        plt.setp(self.ax.get_xticklabels(), ha="right")
+        
+        for spine in ['bottom', 'top', 'left', 'right']:
+            self.ax.spines[spine].set_color('white')
+        
+        # Заголовок в зависимости от роли
+        titles = {
+            'equipment': 'Daily Avg Temperature',
+            'fraud': 'Daily Avg Transaction Time',
+            'security': 'Daily Avg Traffic Volume'
+        }
+        self.ax.set_title(titles.get(self.app.role, ''), color='white')
+        self.ax.legend()
+
+    def _setup_ip_axes(self):
+        """Статичное оформление гистограммы IP-адресов"""
+        self.ax2.set_title('IP Address Frequency', color='white')
+        self.ax2.set_xlabel('IP')
+        self.ax2.set_ylabel('Count')
+        self.ax2.set_facecolor('#001f3f')
+        self.ax2.tick_params(colors='white')
+        self.ax2.tick_params(axis='x', labelrotation=45)
+        plt.setp(self.ax2.get_xticklabels(), ha="right")
+        
+        for spine in ['bottom', 'top', 'left', 'right']:
+            self.ax2.spines[spine].set_color('white')
+
+    def _on_draw(self, event):
+        """Сохранение фона после полной перерисовки (в том числе при изменении размера)"""
+        self._bg = self.canvas.copy_from_bbox(self.fig.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self):
+        self.ax.draw_artist(self.line)
+        self.ax.draw_artist(self.scatter)
+
+    def _rescale_main(self, xs, ys) -> bool:
+        """Расширение пределов осей, если новые данные в них не помещаются"""
+        x0, x1 = self.ax.get_xlim()
+        y0, y1 = self.ax.get_ylim()
+        xmin, xmax = min(xs), max(xs)
+        ymin, ymax = min(ys), max(ys)
+        if x0 <= xmin and xmax <= x1 and y0 <= ymin and ymax <= y1:
+            return False
+        xpad = max((xmax - xmin) * 0.1, 1.0)
+        ypad = max((ymax - ymin) * 0.1, 1.0)
+        self.ax.set_xlim(xmin - xpad, xmax + xpad)
+        self.ax.set_ylim(ymin - ypad, ymax + ypad)
+        return True
 
     def _update_data_and_charts(self):
         """Обновление данных и графиков"""
-        historical_data = self.app.data_storage.get_historical_data(
-            datetime.datetime.min, datetime.datetime.max
-        )
-        filtered_data = [d for d in historical_data if self.app.filter_by_role(d.data_type)]
+        # Дневные средние ведутся хранилищем инкрементально
+        daily_times, daily_avg = self.app.data_storage.get_daily_averages(self.app.role)
         
-        if not filtered_data:
+        if not daily_times:
             return
         
-        # Агрегация данных по дням
-        daily_features = defaultdict(list)
-        for d in filtered_data:
-            day = d.timestamp.date()
-            daily_features[day].append(d.features[0])
-        
-        daily_times = sorted(daily_features.keys())
-        daily_avg = [sum(daily_features[day]) / len(daily_features[day]) for day in daily_times]
-        
         # Получение аномалий
         anomalies = self.app.data_storage.get_anomalies(self.app.role)
-        daily_anomaly_scores = defaultdict(list)
-        for a in anomalies:
-            day = a.detection_time.date()
-            daily_anomaly_scores[day].append(a.score)
-        
-        daily_anomaly_avg = [
-            (sum(daily_anomaly_scores.get(day, [0])) / len(daily_anomaly_scores.get(day, [1]))) 
-            if daily_anomaly_scores.get(day) else None 
-            for day in daily_times
-        ]
-        
-        # Отрисовка основного графика
+        daily_anomaly_scores = self.app.data_storage.get_daily_anomaly_averages(self.app.role)
+        daily_anomaly_avg = [daily_anomaly_scores.get(day) for day in daily_times]
+        
+        # Отрисовка основного графика: полная перерисовка только при смене пределов осей
         if self.ax:
-            self.ax.clear()
-            self.ax.plot(daily_times, daily_avg, label='Avg Feature', color='cyan')
-            anomaly_days = [day for i, day in enumerate(daily_times) if daily_anomaly_avg[i] is not None]
+            day_nums = mdates.date2num(daily_times)
+            anomaly_days = [x for i, x in enumerate(day_nums) if daily_anomaly_avg[i] is not None]
             anomaly_values = [val for val in daily_anomaly_avg if val is not None]
-            if anomaly_days:
-                self.ax.scatter(anomaly_days, anomaly_values, color='red', label='Avg Anomaly Score')
-            
-            self.ax.set_xlabel("Day")
-            self.ax.set_ylabel("Value")
-            self.ax.set_facecolor('#001f3f')
-            self.ax.tick_params(colors='white')
-            
-            for spine in ['bottom', 'top', 'left', 'right']:
-                self.ax.spines[spine].set_color('white')
+            self.line.set_data(day_nums, daily_avg)
+            self.scatter.set_offsets(np.column_stack([anomaly_days, anomaly_values])
+                                     if anomaly_days else np.empty((0, 2)))
             
-            # Заголовок в зависимости от роли
-            titles = {
-                'equipment': 'Daily Avg Temperature',
-                'fraud': 'Daily Avg Transaction Time',
-                'security': 'Daily Avg Traffic Volume'
-            }
-            self.ax.set_title(titles.get(self.app.role, ''), color='white')
-            self.ax.legend()
-            plt.setp(self.ax.get_xticklabels(), rotation=45, ha="right", color='white')
-            self.canvas.draw()
+            if self._rescale_main(day_nums, daily_avg + anomaly_values) or self._bg is None:
+                self.canvas.draw_idle()
+            else:
+                self.canvas.restore_region(self._bg)
+                self._draw_animated()
+                self.canvas.blit(self.fig.bbox)
         
         # Дополнительный график для security
         if self.app.role == 'security' and getattr(self, 'ax2', None):
-            self.ax2.clear()
-            ips = [
-                raw.attributes.get('ip') for raw in self.app.data_storage.raw_data 
-                if raw.attributes.get('type') == '3' and 'ip' in raw.attributes
-            ]
-            ip_counts = Counter(ips)
-            top_ips = list(ip_counts.items())[:10]
+            top_ips = self.app.data_storage.get_top_ips(10)
             
-            if top_ips:
+            # Гистограмма перерисовывается только при изменении данных
+            if top_ips and top_ips != self._last_top_ips:
+                self._last_top_ips = top_ips
+                if self._ip_bars is not None:
+                    self._ip_bars.remove()
                 keys, vals = zip(*top_ips)
-                self.ax2.bar(list(keys), list(vals), color='cyan')
-                self.ax2.set_title('IP Address Frequency', color='white')
-                self.ax2.set_xlabel('IP')
-                self.ax2.set_ylabel('Count')
-                self.ax2.set_facecolor('#001f3f')
-                self.ax2.tick_params(colors='white')
-                
-                for spine in ['bottom', 'top', 'left', 'right']:
-                    self.ax2.spines[spine].set_color('white')
-                
-                plt.setp(self.ax2.get_xticklabels(), rotation=45, ha="right", color='white')
-                self.canvas2.draw()
+                self._ip_bars = self.ax2.bar(list(keys), list(vals), color='cyan')
+                self.ax2.relim()
+                self.ax2.autoscale_view()
+                self.canvas2.draw_idle()
         
         # Обновление списка аномалий
         try:
-            if getattr(self, 'anomaly_list', None) is not None and self.anomaly_list.winfo_exists():
-                self.anomaly_list.delete(0, tk.END)
-                for a in anomalies:
-                    self.anomaly_list.insert(tk.END, f"{a.description} - Score: {a.score}")
+            if self._widgets_alive:
+                # Замена только отличающегося хвоста одним вызовом insert;
+                # строки форматируются только для нового хвоста
+                prev = self._list_anomalies
+                common = 0
+                for old_a, new_a in zip(prev, anomalies):
+                    if old_a is not new_a:
+                        break
+                    common += 1
+                if common < len(prev):
+                    self.anomaly_list.delete(common, tk.END)
+                if common < len(anomalies):
+                    self.anomaly_list.insert(tk.END, *(f"{a.description} - Score: {a.score}"
+                                                       for a in anomalies[common:]))
+                self._list_anomalies = anomalies
         except tk.TclError:
             self._reset_widgets()
 
     def handle_input(self):
         """Обработка ввода пользователя"""
         try:
-            if getattr(self, 'anomaly_list', None) is not None and self.anomaly_list.winfo_exists():
+            if self._widgets_alive:
                 try:
                     self.anomaly_list.unbind('<<ListboxSelect>>')
                 except Exception:
@@ -296,13 +362,26 @@ class HistoricalView(IView):
         self.ax = None
         self.update_id = None
         self.filter_frame = None
+        self._data_key = None
+        self._filter_text = ('', '')
+        # Корневой фрейм представления; при смене представления только скрывается
+        self.frame = None
 
     def render(self):
-        tk.Label(self.app.content, text="Historical Analysis", 
+        if self.frame is not None:
+            self.frame.pack(fill=tk.BOTH, expand=True)
+            # Выборка, прерванная скрытием представления, могла не дойти до отрисовки
+            self._data_key = None
+            self.update_graphs()
+            return
+        
+        self.frame = tk.Frame(self.app.content, bg='#001f3f')
+        self.frame.pack(fill=tk.BOTH, expand=True)
+        tk.Label(self.frame, text="Historical Analysis", 
                 font=("Arial", 16), bg="#001f3f", fg="white").pack(pady=10)
         
         # Фильтры дат
-        self.filter_frame = ttk.Frame(self.app.content)
+        self.filter_frame = ttk.Frame(self.frame)
         self.filter_frame.pack(pady=10)
         
         ttk.Label(self.filter_frame, text="Start Date (YYYY-MM-DD):").pack(side=tk.LEFT)
@@ -315,6 +394,14 @@ class HistoricalView(IView):
         
         ttk.Button(self.filter_frame, text="Filter", command=self.apply_filter).pack(side=tk.LEFT, padx=5)
         
+        # Список подтверждённых аномалий (обновляется по разнице с прошлым состоянием)
+        self.results_list = tk.Listbox(self.frame, height=10, bg='#0a192f', fg="white",
+                                       selectbackground="cyan")
+        self.results_list.pack(side=tk.BOTTOM, fill=tk.X, pady=10)
+        self.results_list.bind('<<ListboxSelect>>', self.show_anomaly_details)
+        self._displayed_anomalies = []
+        self._placeholder_shown = False
+        
         self.update_graphs()
 
     def stop_update(self):
@@ -326,6 +413,9 @@ class HistoricalView(IView):
         if self.app.current_view != self.get_view_name():
             return
         
+        # Отмена уже запланированного обновления, чтобы не плодить цепочки таймеров
+        self.stop_update()
+        
         # Проверка canvas
         try:
             if getattr(self, 'canvas', None) is not None:
@@ -336,79 +426,152 @@ class HistoricalView(IView):
             self.canvas = None
             self.ax = None
         
-        # Получение данных
-        all_anomalies = self.app.anomaly_controller.get_anomalies_in_period(
-            self.start_time, self.end_time, self.app.role
-        )
-        
-        confirmed_ids = set()
-        for al in self.app.alert_service.get_alerts():
-            if al.status == 'confirmed':
-                confirmed_ids.add(al.anomaly_id)
-        
-        anomalies = [a for a in all_anomalies if a.anomaly_id in confirmed_ids]
-        
         # Создание графиков
         if not getattr(self, 'canvas', None):
             self.fig = Figure(figsize=(10, 5), dpi=100, facecolor='#001f3f')
             self.ax = self.fig.add_subplot(111)
-            self.canvas = FigureCanvasTkAgg(self.fig, master=self.app.content)
+            self.canvas = FigureCanvasTkAgg(self.fig, master=self.frame)
             self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+            self._setup_axes()
+            self._data_key = None
+        
+        # Пересчёт только при изменении аномалий, оповещений или фильтра
+        data_key = (self.app.data_storage.anomalies_version, self.app.alert_service.version,
+                    self.start_time, self.end_time)
+        if data_key == self._data_key:
+            self.update_id = self.app.after(_IDLE_REFRESH_MS, self.update_graphs)
+            return
+        self._data_key = data_key
         
-        # Отрисовка графика
-        self.ax.clear()
+        # Выборка данных выполняется в фоновом потоке, отрисовка — в главном
+        future = self.app.executor.submit(self._fetch_confirmed_anomalies, self.start_time, self.end_time)
+        self.update_id = self.app.after(50, self._poll_fetch, future)
+
+    def _fetch_confirmed_anomalies(self, start_time, end_time):
+        """Подтверждённые аномалии за период (выполняется вне потока Tk)"""
+        all_anomalies = self.app.anomaly_controller.get_anomalies_in_period(
+            start_time, end_time, self.app.role
+        )
+        confirmed_ids = self.app.alert_service.get_confirmed_anomaly_ids(self.app.allowed_type)
+        return [a for a in all_anomalies if a.anomaly_id in confirmed_ids]
+
+    def _poll_fetch(self, future):
+        if self.app.current_view != self.get_view_name():
+            return
+        if not future.done():
+            self.update_id = self.app.after(50, self._poll_fetch, future)
+            return
+        try:
+            anomalies = future.result()
+        except Exception:
+            # Выборка не удалась: ключ сбрасывается, чтобы следующее обновление повторило её
+            self._data_key = None
+        else:
+            self._render_anomalies(anomalies)
+        self.update_id = self.app.after(_REFRESH_MS, self.update_graphs)
+
+    def _render_anomalies(self, anomalies):
+        """Отрисовка графика и списка по полученным аномалиям"""
+        # Отрисовка графика: высоты столбцов меняются на месте, пересоздаются только при смене дней
         if anomalies:
-            daily_counts = defaultdict(int)
-            for a in anomalies:
-                day = a.detection_time.date()
-                daily_counts[day] += 1
-            
-            daily_times = sorted(daily_counts.keys())
-            counts = [daily_counts[day] for day in daily_times]
-            self.ax.bar(daily_times, counts)
-            self.ax.set_title('Daily Confirmed Anomaly Counts', color='white')
+            # Гистограмма по порядковым номерам дней через np.bincount
+            ordinals = np.fromiter((a.detection_date.toordinal() for a in anomalies),
+                                   dtype=np.int64, count=len(anomalies))
+            first = ordinals.min()
+            counts = np.bincount(ordinals - first)
+            offsets = np.flatnonzero(counts)
+            daily_times, counts = offsets + first, counts[offsets]
         else:
-            self.ax.text(0.5, 0.5, "No confirmed anomalies in the selected range", 
-                        ha='center', va='center', transform=self.ax.transAxes, color='white')
-            self.ax.set_title('Daily Confirmed Anomaly Counts', color='white')
+            daily_times, counts = np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+        
+        if not np.array_equal(daily_times, self._bar_days):
+            if self._bars is not None:
+                self._bars.remove()
+                self._bars = None
+            if len(daily_times):
+                days = [datetime.date.fromordinal(o) for o in daily_times.tolist()]
+                self._bars = self.ax.bar(days, counts)
+            self._bar_days, self._bar_counts = daily_times, counts
+            self._empty_text.set_visible(not len(daily_times))
+            self.ax.relim()
+            self.ax.autoscale_view()
+            self.canvas.draw_idle()
+        elif not np.array_equal(counts, self._bar_counts):
+            for bar, count in zip(self._bars, counts):
+                bar.set_height(count)
+            self._bar_counts = counts
+            self.ax.relim()
+            self.ax.autoscale_view()
+            self.canvas.draw_idle()
         
+        # Список аномалий
+        self._update_results_list(anomalies)
+
+    def _setup_axes(self):
+        """Статичное оформление графика, выполняется один раз при создании canvas"""
+        self._bars = None
+        self._bar_days = None
+        self._bar_counts = None
+        self._empty_text = self.ax.text(0.5, 0.5, "No confirmed anomalies in the selected range", 
+                                        ha='center', va='center', transform=self.ax.transAxes, 
+                                        color='white')
+        self.ax.xaxis_date()
+        self.ax.set_title('Daily Confirmed Anomaly Counts', color='white')
         self.ax.set_xlabel("Day")
         self.ax.set_ylabel("Count")
         self.ax.set_facecolor('#001f3f')
         self.ax.tick_params(colors='white')
+        self.ax.tick_params(axis='x', labelrotation=45)
+        plt.setp(self.ax.get_xticklabels(), ha="right")
         
         for spine in ['bottom', 'top', 'left', 'right']:
             self.ax.spines[spine].set_color('white')
+
+    def _update_results_list(self, anomalies):
+        """Изменение только отличающегося хвоста списка"""
+        if not anomalies:
+            if not self._placeholder_shown:
+                self.results_list.delete(0, tk.END)
+                self.results_list.insert(tk.END, "No confirmed anomalies found for selected period.")
+                self._placeholder_shown = True
+                self._displayed_anomalies = []
+            return
         
-        plt.setp(self.ax.get_xticklabels(), rotation=45, ha="right", color='white')
-        self.canvas.draw()
-        
-        # Список аномалий
-        if not hasattr(self, 'results_frame') or not getattr(self, 'results_frame').winfo_exists():
-            self.results_frame = tk.Frame(self.app.content, bg='#001f3f')
-            self.results_frame.pack(fill=tk.X, pady=10)
-        else:
-            for w in self.results_frame.winfo_children():
-                w.destroy()
-        
-        if anomalies:
-            for a in anomalies:
-                lbl = ttk.Label(self.results_frame, text=f"{a.description} at {a.detection_time}")
-                lbl.pack(anchor='w', pady=2, padx=5)
-                lbl.bind("<Button-1>", lambda e, anomaly=a: AnomalyConfirmationDialog(self.app, anomaly))
-        else:
-            ttk.Label(self.results_frame, text="No confirmed anomalies found for selected period.").pack(anchor='w')
-        
-        self.update_id = self.app.after(1000, self.update_graphs)
+        if self._placeholder_shown:
+            self.results_list.delete(0, tk.END)
+            self._placeholder_shown = False
+        
+        prev = self._displayed_anomalies
+        common = 0
+        for old_a, new_a in zip(prev, anomalies):
+            if old_a.anomaly_id != new_a.anomaly_id:
+                break
+            common += 1
+        if common < len(prev):
+            self.results_list.delete(common, tk.END)
+        if common < len(anomalies):
+            self.results_list.insert(tk.END, *(f"{a.description} at {a.detection_time}"
+                                               for a in anomalies[common:]))
+        self._displayed_anomalies = list(anomalies)
+
+    def show_anomaly_details(self, event):
+        """Показать детали выбранной аномалии"""
+        selection = self.results_list.curselection()
+        if selection and selection[0] < len(self._displayed_anomalies):
+            AnomalyConfirmationDialog(self.app, self._displayed_anomalies[selection[0]])
 
     def apply_filter(self):
         """Применить фильтр дат"""
         try:
             start_str = self.hist_start_date_entry.get()
             end_str = self.hist_end_date_entry.get()
+            # Повторный фильтр с теми же датами: границы уже разобраны и применены
+            if (start_str, end_str) == self._filter_text:
+                return
             
             self.start_time = datetime.datetime.strptime(start_str, "%Y-%m-%d") if start_str else datetime.datetime.min
             self.end_time = datetime.datetime.strptime(end_str, "%Y-%m-%d") if end_str else datetime.datetime.max
+            self._filter_text = (start_str, end_str)
             
             self.update_graphs()
         except ValueError:
@@ -425,10 +588,39 @@ class AlertsView(IView):
     def __init__(self, app):
         self.app = app
         self.update_id = None
+        # Корневой фрейм представления; при смене представления только скрывается
+        self.frame = None
 
     def render(self):
-        tk.Label(self.app.content, text="Alerts", 
+        if self.frame is not None:
+            self.frame.pack(fill=tk.BOTH, expand=True)
+            self._alerts_version = None
+            self.update_alerts()
+            return
+        
+        self.frame = tk.Frame(self.app.content, bg='#001f3f')
+        self.frame.pack(fill=tk.BOTH, expand=True)
+        tk.Label(self.frame, text="Alerts", 
                 font=("Arial", 16), bg="#001f3f", fg="white").pack(pady=10)
+        
+        self._layout = None
+        self._alerts_version = None
+        self._new_header = ttk.Label(self.frame, font=("Arial", 12, "bold"),
+                                     background='#001f3f', foreground='yellow')
+        self._new_header.pack(fill=tk.X, padx=5, pady=(5, 2))
+        
+        # Одна таблица вместо отдельного фрейма на каждое оповещение; строки по alert_id
+        self._tree = ttk.Treeview(self.frame, columns=('badge', 'message'), show='headings')
+        self._tree.heading('badge', text='')
+        self._tree.heading('message', text='Confirmed Alerts', anchor='w')
+        self._tree.column('badge', width=60, stretch=False, anchor='center')
+        self._tree.column('message', anchor='w')
+        self._tree.tag_configure('new', foreground='yellow')
+        self._tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=2)
+        self._row_is_new = {}
+        
+        ttk.Button(self.frame, text="Acknowledge",
+                   command=self.acknowledge_selected).pack(anchor='e', padx=5, pady=5)
         self.update_alerts()
 
     def stop_update(self):
@@ -440,80 +632,87 @@ class AlertsView(IView):
         if self.app.current_view != self.get_view_name():
             return
         
-        # Очистка контента
-        for widget in self.app.content.winfo_children()[1:]:
-            widget.destroy()
+        # Вызов может прийти и от AlertService: отменяем уже запланированный опрос
+        self.stop_update()
         
-        role_map = {
-            'security': 'traffic',
-            'equipment': 'sensor',
-            'fraud': 'transaction'
-        }
-        allowed_type = role_map.get(self.app.role, '')
-        
-        # Сбор подтвержденных оповещений
-        confirmed_alerts = []
-        for al in self.app.alert_service.get_alerts():
-            if al.status == 'confirmed':
-                anomaly = self.app.data_storage.get_anomaly(al.anomaly_id)
-                if anomaly and anomaly.description.startswith(allowed_type + ":"):
-                    confirmed_alerts.append((al, anomaly))
-        
-        # Разделение на новые и старые
-        last_visit = getattr(self.app, 'last_alerts_view_time', datetime.datetime.min)
-        new_alerts = []
-        old_alerts = []
-        
-        for al, anomaly in confirmed_alerts:
-            conf_time = self.app.alert_service.confirmed_times.get(al.alert_id, al.time_raised)
-            if conf_time > last_visit:
-                new_alerts.append((al, anomaly))
-            else:
-                old_alerts.append((al, anomaly))
+        # Пока есть строки в разделе новых, они должны переехать в старые; иначе без изменений нечего делать
+        version = self.app.alert_service.version
+        has_new = self._layout is not None and any(is_new for _, is_new in self._layout)
+        if version == self._alerts_version and not has_new:
+            self.app.last_alerts_view_time = time.monotonic_ns()
+            self.update_id = self.app.after(_IDLE_REFRESH_MS, self.update_alerts)
+            return
+        self._alerts_version = version
         
-        # Отображение новых оповещений
-        if new_alerts:
-            header = ttk.Label(self.app.content, text=f"New Confirmed Alerts ({len(new_alerts)})",
-                             font=("Arial", 12, "bold"), background='#001f3f', foreground='yellow')
-            header.pack(fill=tk.X, pady=(5, 2))
-            
-            for al, anomaly in new_alerts:
-                frame = ttk.Frame(self.app.content)
-                frame.pack(fill=tk.X, pady=2, padx=5)
-                
-                new_badge = tk.Label(frame, text="NEW", bg='red', fg='white', padx=6)
-                new_badge.pack(side=tk.LEFT, padx=(0, 6))
-                
-                ttk.Label(frame, text=al.message).pack(side=tk.LEFT, expand=True, fill=tk.X)
-                
-                ttk.Button(frame, text="Acknowledge",
-                         command=lambda aid=al.alert_id: self.app.anomaly_controller.acknowledge_alert(aid)).pack(side=tk.RIGHT)
-        
-        # Отображение старых оповещений
-        if old_alerts:
-            header2 = ttk.Label(self.app.content, text="Confirmed Alerts", 
-                              font=("Arial", 12, "bold"), background='#001f3f', foreground='white')
-            header2.pack(fill=tk.X, pady=(10, 2))
-            
-            for al, anomaly in old_alerts:
-                frame = ttk.Frame(self.app.content)
-                frame.pack(fill=tk.X, pady=2, padx=5)
-                
-                ttk.Label(frame, text=al.message).pack(side=tk.LEFT, expand=True, fill=tk.X)
-                
-                ttk.Button(frame, text="Acknowledge",
-                         command=lambda aid=al.alert_id: self.app.anomaly_controller.acknowledge_alert(aid)).pack(side=tk.RIGHT)
+        # Подтверждённые оповещения для роли пользователя, разделённые на новые и старые
+        last_visit = getattr(self.app, 'last_alerts_view_time', 0)
+        new_confirmed, old_confirmed = self.app.alert_service.split_confirmed_alerts(
+            self.app.allowed_type, last_visit
+        )
+        new_alerts = self._with_anomalies(new_confirmed)
+        old_alerts = self._with_anomalies(old_confirmed)
         
-        # Сообщение если нет оповещений
-        if not new_alerts and not old_alerts:
-            ttk.Label(self.app.content, text="No confirmed alerts for your role.", 
-                     background='#001f3f').pack(pady=10)
+        # Перестройка только при изменении набора строк
+        layout = ([(al.alert_id, True) for al, _ in new_alerts]
+                  + [(al.alert_id, False) for al, _ in old_alerts])
+        if layout != self._layout:
+            self._apply_layout(new_alerts, old_alerts)
+            self._layout = layout
         
         # Обновление времени последнего посещения
-        self.app.last_alerts_view_time = datetime.datetime.now()
+        self.app.last_alerts_view_time = time.monotonic_ns()
         
         # Планирование следующего обновления
-        self.update_id = self.app.after(1000, self.update_alerts)
+        self.update_id = self.app.after(_REFRESH_MS, self.update_alerts)
+
+    def _with_anomalies(self, alerts):
+        """Пары (оповещение, аномалия) для оповещений, чья аномалия есть в хранилище"""
+        pairs = []
+        for al in alerts:
+            anomaly = self.app.data_storage.get_anomaly(al.anomaly_id)
+            if anomaly:
+                pairs.append((al, anomaly))
+        return pairs
+
+    def _apply_layout(self, new_alerts, old_alerts):
+        """Удаление исчезнувших строк, добавление новых и перестановка в нужном порядке"""
+        rows = [(al, anomaly, True) for al, anomaly in new_alerts]
+        rows += [(al, anomaly, False) for al, anomaly in old_alerts]
+        ids = {al.alert_id for al, _, _ in rows}
+        gone = [alert_id for alert_id in self._row_is_new if alert_id not in ids]
+        if gone:
+            self._tree.delete(*gone)
+            for alert_id in gone:
+                del self._row_is_new[alert_id]
+        
+        for index, (al, anomaly, is_new) in enumerate(rows):
+            alert_id = al.alert_id
+            if alert_id not in self._row_is_new:
+                self._tree.insert('', index, iid=alert_id, tags=('new',) if is_new else (),
+                                  values=("NEW" if is_new else "", self._format_message(al, anomaly)))
+            else:
+                if self._row_is_new[alert_id] != is_new:
+                    self._tree.item(alert_id, tags=('new',) if is_new else (),
+                                    values=("NEW" if is_new else "", self._format_message(al, anomaly)))
+                self._tree.move(alert_id, '', index)
+            self._row_is_new[alert_id] = is_new
+        
+        if new_alerts:
+            self._new_header.configure(text=f"New Confirmed Alerts ({len(new_alerts)})")
+        elif old_alerts:
+            self._new_header.configure(text="")
+        else:
+            self._new_header.configure(text="No confirmed alerts for your role.")
+
+    def acknowledge_selected(self):
+        """Подтверждение получения выбранных оповещений"""
+        for alert_id in self._tree.selection():
+            self.app.anomaly_controller.acknowledge_alert(alert_id)
+
+    @staticmethod
+    def _format_message(al: Alert, anomaly: Anomaly) -> str:
+        """Текст оповещения формируется только при отображении"""
+        return f"Alert for user {al.username}: Anomaly {anomaly.description} Score: {anomaly.score}"
 
     def handle_input(self):
         pass
@@ -529,18 +728,27 @@ class SettingsView(IView):
         self.sens_label = None
         self.set_button = None
         self.tune_button = None
+        # Корневой фрейм представления; при смене представления только скрывается
+        self.frame = None
 
     def render(self):
-        tk.Label(self.app.content, text="Settings", 
-                font=("Arial", 16), bg="#001f3f", fg="white").pack(pady=10)
-        
         settings = self.app.config_controller.get_settings_for_user(self.app.current_user.user_id)
+        if self.frame is not None:
+            self.frame.pack(fill=tk.BOTH, expand=True)
+            self.sens_scale.set(settings.sensitivity)
+            self.update_label(settings.sensitivity)
+            return
+        
+        self.frame = tk.Frame(self.app.content, bg='#001f3f')
+        self.frame.pack(fill=tk.BOTH, expand=True)
+        tk.Label(self.frame, text="Settings", 
+                font=("Arial", 16), bg="#001f3f", fg="white").pack(pady=10)
         
-        tk.Label(self.app.content, text="Sensitivity:", 
+        tk.Label(self.frame, text="Sensitivity:", 
                 font=("Arial", 12), bg="#001f3f", fg="white").pack()
         
         # Контейнер для центрирования
-        center_container = tk.Frame(self.app.content, bg="#001f3f")
+        center_container = tk.Frame(self.frame, bg="#001f3f")
         center_container.pack(fill=tk.X, pady=10)
         
         sens_frame = tk.Frame(center_container, bg="#001f3f")
@@ -555,10 +763,10 @@ class SettingsView(IView):
         self.sens_scale.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=10)
         
         # Кнопки
-        self.set_button = ttk.Button(self.app.content, text="Set Sensitivity")
+        self.set_button = ttk.Button(self.frame, text="Set Sensitivity")
         self.set_button.pack(pady=5)
         
-        self.tune_button = ttk.Button(self.app.content, text="Tune Sensitivity")
+        self.tune_button = ttk.Button(self.frame, text="Tune Sensitivity")
         self.tune_button.pack(pady=5)
 
     def update_label(self, value):
@@ -569,8 +777,9 @@ class SettingsView(IView):
         """Установка чувствительности"""
         s = self.sens_scale.get()
         settings = self.app.config_controller.get_settings_for_user(self.app.current_user.user_id)
-        settings.sensitivity = s
+        settings = dataclasses.replace(settings, sensitivity=s)
         self.app.config_controller.save_user_settings(settings)
+        self.app.anomaly_controller.refresh_settings()
         self.app.anomaly_controller.update_global_sensitivity(s)
         messagebox.showinfo("Success", f"Sensitivity set to {s:.2f}")
         self.app.switch_view("Settings")